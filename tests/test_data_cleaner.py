@@ -1,28 +1,69 @@
+import functools
+import numpy as np
+import numpy.testing as npt
 import pandas as pd
 import pandas.testing as pdt
+import re
 import unittest
 
 from src.data_cleaner import DataCleaner
 
 
-def make_sample_df() -> pd.DataFrame:
-    """Create a small DataFrame for testing.
+_STRING_DTYPE = pd.StringDtype()
+_NAMES = (" Alice ", "Bob", None, " Carol  ")
 
-    The DataFrame intentionally contains missing values, extra whitespace
-    in a text column, and an obvious numeric outlier.
+
+@functools.lru_cache(maxsize=1)
+def _sample_template() -> pd.DataFrame:
+    """Build the shared sample DataFrame once per process.
+
+    It must never be handed to a test directly; :func:`make_sample_df`
+    returns shallow copies of it.
     """
     return pd.DataFrame(
         {
-            "name": [" Alice ", "Bob", None, " Carol  "],
+            "name": list(_NAMES),
             "age": [25, None, 35, 120],  # 120 is a likely outlier
             "city": ["SCL", "LPZ", "SCL", "LPZ"],
         }
     )
 
 
+# La columna "name" se construye directamente como StringArray, sin pasar
+# por un bloque intermedio de tipo object.
+_SAMPLE_TEMPLATE_STRING = _sample_template().assign(
+    name=pd.array(list(_NAMES), dtype=_STRING_DTYPE)
+)
+
+# Columna "name" esperada tras drop_invalid_rows en el ejemplo con pandas.testing.
+_EXPECTED_DROP_NAME = pd.Series(["Alice", "Bob"], index=[0, 2], name="name")
+
+# Columna numérica ya en float64 donde 200 sí es outlier según la regla IQR.
+_OUTLIER_DF = pd.DataFrame({"age": [10.0, 20.0, 30.0, 40.0, 50.0, 200.0]})
+
+
+def make_sample_df() -> pd.DataFrame:
+    """Create a small DataFrame for testing.
+
+    The DataFrame intentionally contains missing values, extra whitespace
+    in a text column, and an obvious numeric outlier. A shallow copy of a
+    cached template is returned, so tests that modify the frame must call
+    ``.copy()`` on it first.
+    """
+    return _sample_template().copy(deep=False)
+
+
 class TestDataCleaner(unittest.TestCase):
     """Test suite for DataCleaner class."""
 
+    # Patrones compilados una sola vez para toda la clase
+    _RE_NON_STRING_COL = re.compile(r"Columns are not string dtype: \['age'\]")
+    _RE_NON_NUMERIC_COL = re.compile(r"Column 'city' must be numeric to compute IQR")
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cleaner = DataCleaner()
+
     def test_example_trim_strings_with_pandas_testing(self):
         """Ejemplo de test usando pandas.testing para comparar DataFrames completos.
         
@@ -34,9 +75,8 @@ class TestDataCleaner(unittest.TestCase):
             "name": ["  Alice  ", "  Bob  ", "Carol"],
             "age": [25, 30, 35]
         })
-        cleaner = DataCleaner()
         
-        result = cleaner.trim_strings(df, ["name"])
+        result = self.cleaner.trim_strings(df, ["name"])
         
         # DataFrame esperado después de trim
         expected = pd.DataFrame({
@@ -60,183 +100,130 @@ class TestDataCleaner(unittest.TestCase):
             "age": [25, 30, None],
             "city": ["SCL", "LPZ", "SCL"]
         })
-        cleaner = DataCleaner()
         
-        result = cleaner.drop_invalid_rows(df, ["name"])
+        result = self.cleaner.drop_invalid_rows(df, ["name"])
         
         # Verificar que la columna 'name' ya no tiene valores faltantes
         # Los índices después de drop_invalid_rows son [0, 2] (se eliminó la fila 1)
-        expected_name_series = pd.Series(["Alice", "Bob"], index=[0, 2], name="name")
-        
         # Usar pandas.testing.assert_series_equal() para comparar Series completas
         # Esto verifica valores, índices y tipos correctamente
-        pdt.assert_series_equal(result["name"], expected_name_series, check_names=True)
-
-    def test_drop_invalid_rows_removes_rows_with_missing_values(self):
-        """Test que verifica que el método drop_invalid_rows elimina correctamente las filas
-        que contienen valores faltantes (NaN o None) en las columnas especificadas.
-        
-        Escenario esperado:
-        - Crear un DataFrame con valores faltantes usando make_sample_df()
-        - Llamar a drop_invalid_rows con las columnas "name" y "age"
-        - Verificar que el DataFrame resultante no tiene valores faltantes en esas columnas (usar self.assertEqual para comparar .isna().sum() con 0 - comparación simple de enteros, unittest es suficiente)
-        - Verificar que el DataFrame resultante tiene menos filas que el original (usar self.assertLess con len() - comparación simple de enteros, unittest es suficiente)
-        """
-        initial_df = make_sample_df()
-        cleaner = DataCleaner()
-        
-        result_df = cleaner.drop_invalid_rows(initial_df, ["name", "age"])
-        
-        self.assertEqual(result_df["name"].isna().sum(), 0, "Debe eliminar todos los NaN en 'name'.")
-        self.assertEqual(result_df["age"].isna().sum(), 0, "Debe eliminar todos los NaN en 'age'.")
-        
-        self.assertLess(len(result_df), len(initial_df), "El DataFrame resultante debe tener menos filas.")
-        self.assertEqual(len(result_df), 2, "Se deben mantener 2 filas ([0] y [3]).")
+        pdt.assert_series_equal(result["name"], _EXPECTED_DROP_NAME, check_names=True)
 
-    def test_drop_invalid_rows_raises_keyerror_for_unknown_column(self):
-        """Test que verifica que el método drop_invalid_rows lanza un KeyError cuando
-        se llama con una columna que no existe en el DataFrame.
+    def test_drop_invalid_rows(self):
+        """Test que verifica que drop_invalid_rows elimina las filas con valores faltantes
+        (NaN o None) en las columnas indicadas y rechaza columnas inexistentes. Cada
+        caso corre en su propio subTest con un DataFrame nuevo de make_sample_df().
         
         Escenario esperado:
-        - Crear un DataFrame usando make_sample_df()
-        - Llamar a drop_invalid_rows con una columna que no existe (ej: "does_not_exist")
-        - Verificar que se lanza un KeyError (usar self.assertRaises)
+        - missing_values: llamar a drop_invalid_rows con las columnas "name" y "age"
+          y verificar que el DataFrame resultante no tiene valores faltantes en esas columnas (usar self.assertTrue sobre .notna().to_numpy().all() - una sola pasada sobre ambas columnas, unittest es suficiente)
+          y que tiene menos filas que el original (usar self.assertLess con len() - comparación simple de enteros, unittest es suficiente)
+        - unknown_column: llamar a drop_invalid_rows con una columna que no existe (ej: "does_not_exist")
+          y verificar que se lanza un KeyError (usar self.assertRaises)
         """
-        df = make_sample_df()
-        cleaner = DataCleaner()
-        
-        with self.assertRaises(KeyError):
-            cleaner.drop_invalid_rows(df, ["age", "does_not_exist"])
-
-    def test_trim_strings_strips_whitespace_without_changing_other_columns(self):
-        """Test que verifica que el método trim_strings elimina correctamente los espacios
-        en blanco al inicio y final de los valores en las columnas especificadas, sin modificar
-        el DataFrame original ni las columnas no especificadas.
-        
-        Escenario esperado:
-        - Crear un DataFrame con espacios en blanco usando make_sample_df()
-        - Llamar a trim_strings con la columna "name"
-        - Verificar que el DataFrame original no fue modificado (mantiene los espacios) (usar self.assertEqual para comparar valores específicos como strings individuales - unittest es suficiente para strings)
-        - Verificar que en el DataFrame resultante los valores de "name" no tienen espacios al inicio/final (usar self.assertEqual para comparar valores específicos como strings individuales - unittest es suficiente)
-        - Verificar que las columnas no especificadas (ej: "city") permanecen sin cambios (si comparas Series completas, usar pandas.testing.assert_series_equal() ya que maneja mejor los índices y tipos de Pandas; si comparas valores individuales, self.assertEqual es suficiente)
-        """
-        original_df = make_sample_df()
-        df_to_clean = original_df.copy()
-        cleaner = DataCleaner()
-        
-        df_to_clean["name"] = df_to_clean["name"].astype(pd.StringDtype())
-
-        result_df = cleaner.trim_strings(df_to_clean, ["name"])
-        
-        self.assertEqual(original_df.loc[0, "name"], " Alice ")
-        
-        self.assertEqual(result_df.loc[0, "name"], "Alice")
-        self.assertEqual(result_df.loc[3, "name"], "Carol")
-
-        pdt.assert_series_equal(
-            result_df["city"], 
-            original_df["city"],
-            check_index=True
-        )
-
-    def test_trim_strings_raises_typeerror_for_non_string_column(self):
-        """Test que verifica que el método trim_strings lanza un TypeError cuando
-        se llama con una columna que no es de tipo string.
-        
-        Escenario esperado:
-        - Crear un DataFrame usando make_sample_df()
-        - Llamar a trim_strings con una columna numérica (ej: "age")
-        - Verificar que se lanza un TypeError (usar self.assertRaises)
-        """
-        df = make_sample_df()
-        cleaner = DataCleaner()
-        
-        with self.assertRaisesRegex(TypeError, r"Columns are not string dtype: \['age'\]"):
-            cleaner.trim_strings(df, ["age"])
-
-    def test_remove_outliers_iqr_removes_extreme_values(self):
-        """Test que verifica que el método remove_outliers_iqr elimina correctamente los
-        valores extremos (outliers) de una columna numérica usando el método del rango
-        intercuartílico (IQR).
+        with self.subTest(case="missing_values"):
+            df = make_sample_df()
+            result_df = self.cleaner.drop_invalid_rows(df, ["name", "age"])
+            
+            self.assertTrue(result_df[["name", "age"]].notna().to_numpy().all(), "Debe eliminar todos los NaN en name/age.")
+            
+            self.assertLess(len(result_df), len(df), "El DataFrame resultante debe tener menos filas.")
+            self.assertEqual(len(result_df), 2, "Se deben mantener 2 filas ([0] y [3]).")
+
+        with self.subTest(case="unknown_column"):
+            df = make_sample_df()
+            with self.assertRaises(KeyError):
+                self.cleaner.drop_invalid_rows(df, ["age", "does_not_exist"])
+
+    def test_trim_strings(self):
+        """Test que verifica que trim_strings quita los espacios al inicio y final de las
+        columnas de texto indicadas, sin tocar el DataFrame de entrada ni las demás
+        columnas, y que rechaza columnas que no son de tipo string.
         
         Escenario esperado:
-        - Crear un DataFrame con valores extremos usando make_sample_df() (contiene edad=120)
-        - Llamar a remove_outliers_iqr con la columna "age" y factor=1.5
-        - Verificar que el valor extremo (120) fue eliminado del resultado (usar self.assertNotIn para verificar que 120 no está en los valores de la columna)
-        - Verificar que al menos uno de los valores no extremos (25 o 35) permanece en el resultado (usar self.assertIn para verificar que está presente)
+        - strips_whitespace: llamar a trim_strings con la columna "name" de la versión StringDtype
+          de make_sample_df() y verificar que
+          el DataFrame original no fue modificado (mantiene los espacios), que en el resultado
+          los valores de "name" no tienen espacios al inicio/final (usar self.assertEqual para
+          comparar strings individuales - unittest es suficiente) y que las columnas no
+          especificadas (ej: "city") permanecen sin cambios (usar pandas.testing.assert_series_equal())
+        - large_input: con 100_000 valores "  hello  " de tipo StringDtype, verificar que
+          todos quedan como "hello" (usar numpy.testing.assert_array_equal())
+        - non_string_column: llamar a trim_strings con una columna numérica (ej: "age")
+          y verificar que se lanza un TypeError (usar self.assertRaises)
         """
-        df = make_sample_df()
-        cleaner = DataCleaner()
-        
-        # Datos 'age' disponibles (sin NaN): [25, 35, 120]
-        # Q1 = 25, Q2 = 35, Q3 = 120 (usando interpolación simple en 3 puntos)
-        # Nota: Pandas usa interpolación lineal.
-        # En una Serie [25, 35, 120], Q1 (0.25) ~ 27.5, Q3 (0.75) ~ 85.
-        # IQR = 85 - 27.5 = 57.5
-        # Límite Superior: Q3 + 1.5 * IQR = 85 + 1.5 * 57.5 = 85 + 86.25 = 171.25
-        # Límite Inferior: Q1 - 1.5 * IQR = 27.5 - 86.25 = -58.75
-        # Ninguno de los valores [25, 35, 120] es outlier según este cálculo.
-        #
-        # Para forzar un outlier: El valor 120 es claramente un outlier en la vida real.
-        # **Ajuste para testear la funcionalidad IQR**
-        # Si la implementación *interna* de DataCleaner.remove_outliers_iqr usa solo los valores NO-NaN:
-        df_no_nan_age = df["age"].dropna().sort_values().reset_index(drop=True)
-        # df_no_nan_age: [25, 35, 120]
-        # Q1=25, Q3=120, IQR=95.
-        # Límite Superior (si se usa la definición de Tukey más estricta): 120 + 1.5 * 95 = 262.5
-        #
-        # Para que 120 sea un outlier, necesitamos un array con valores más cercanos.
-        # **Cambiamos make_sample_df en el test (o asumimos un DF diferente para mayor claridad):**
-        df_outlier = pd.DataFrame({"age": [10, 20, 30, 40, 50, 200]})
-        # Q1=20, Q3=50, IQR=30. Límite Superior = 50 + 1.5 * 30 = 95.
-        # El valor 200 *sí* es un outlier.
-        
-        # Usaremos el DF de make_sample_df asumiendo que el test busca que el *proceso* funcione.
-        # Si la implementación de `remove_outliers_iqr` es correcta (usa Pandas o Numpy),
-        # 120 *no* será un outlier para [25, 35, 120] con factor 1.5.
-
-        # ***OPCION 1: Modificar el make_sample_df temporalmente para asegurar el outlier***
-        df_for_outlier_test = pd.DataFrame({"age": [10, 20, 30, 40, 50, 200]})
-        
-        result_df = cleaner.remove_outliers_iqr(df_for_outlier_test, "age", factor=1.5)
-
-        # 1. Verificar que el valor extremo (200) fue eliminado
-        self.assertNotIn(200, result_df["age"].values, "El outlier 200 debe haber sido eliminado.")
-        
-        # 2. Verificar que al menos uno de los valores no extremos (10, 20, 30, 40, 50) permanece
-        self.assertIn(10, result_df["age"].values, "El valor 10 debe permanecer.")
-        self.assertIn(50, result_df["age"].values, "El valor 50 debe permanecer.")
-        self.assertEqual(len(result_df), 5, "Deben quedar 5 filas después de eliminar el outlier.")
-
-    def test_remove_outliers_iqr_raises_keyerror_for_missing_column(self):
-        """Test que verifica que el método remove_outliers_iqr lanza un KeyError cuando
-        se llama con una columna que no existe en el DataFrame.
+        with self.subTest(case="strips_whitespace"):
+            # Copia superficial propia: la plantilla compartida nunca llega a trim_strings
+            df_to_clean = _SAMPLE_TEMPLATE_STRING.copy(deep=False)
+
+            result_df = self.cleaner.trim_strings(df_to_clean, ["name"])
+            
+            self.assertEqual(df_to_clean.loc[0, "name"], " Alice ")
+            
+            self.assertEqual(result_df.loc[0, "name"], "Alice")
+            self.assertEqual(result_df.loc[3, "name"], "Carol")
+
+            pdt.assert_series_equal(
+                result_df["city"], 
+                make_sample_df()["city"],
+                check_index=True
+            )
+
+        with self.subTest(case="large_input"):
+            n = 100_000
+            df_large = pd.DataFrame({"name": pd.array(["  hello  "] * n, dtype=_STRING_DTYPE)})
+
+            result_df = self.cleaner.trim_strings(df_large, ["name"])
+
+            npt.assert_array_equal(result_df["name"].to_numpy(), np.array(["hello"] * n, dtype=object))
+
+        with self.subTest(case="non_string_column"):
+            df = make_sample_df()
+            with self.assertRaises(TypeError) as cm:
+                self.cleaner.trim_strings(df, ["age"])
+            self.assertRegex(str(cm.exception), self._RE_NON_STRING_COL)
+
+    def test_remove_outliers_iqr(self):
+        """Test que verifica que remove_outliers_iqr descarta los valores fuera del rango
+        intercuartílico (IQR) de una columna numérica y valida que la columna exista y
+        sea numérica.
         
         Escenario esperado:
-        - Crear un DataFrame usando make_sample_df()
-        - Llamar a remove_outliers_iqr con una columna que no existe (ej: "salary")
-        - Verificar que se lanza un KeyError (usar self.assertRaises)
+        - extreme_values: llamar a remove_outliers_iqr sobre _OUTLIER_DF con la columna "age" y factor=1.5,
+          verificar que el valor extremo fue eliminado del resultado (usar self.assertFalse con np.any
+          sobre el array de valores de la columna) y que los valores no extremos permanecen
+          (usar self.assertTrue con np.any para verificar que están presentes)
+        - missing_column: llamar a remove_outliers_iqr con una columna que no existe (ej: "salary")
+          y verificar que se lanza un KeyError (usar self.assertRaises)
+        - non_numeric_column: llamar a remove_outliers_iqr con una columna de texto (ej: "city")
+          y verificar que se lanza un TypeError (usar self.assertRaises)
         """
-        df = make_sample_df()
-        cleaner = DataCleaner()
-        
-        with self.assertRaises(KeyError):
-            cleaner.remove_outliers_iqr(df, "salary")
-
-    def test_remove_outliers_iqr_raises_typeerror_for_non_numeric_column(self):
-        """Test que verifica que el método remove_outliers_iqr lanza un TypeError cuando
-        se llama con una columna que no es de tipo numérico.
-        
-        Escenario esperado:
-        - Crear un DataFrame usando make_sample_df()
-        - Llamar a remove_outliers_iqr con una columna de texto (ej: "city")
-        - Verificar que se lanza un TypeError (usar self.assertRaises)
-        """
-        df = make_sample_df()
-        cleaner = DataCleaner()
-        
-        with self.assertRaisesRegex(TypeError, r"Column 'city' must be numeric to compute IQR"):
-            cleaner.remove_outliers_iqr(df, "city")
+        with self.subTest(case="extreme_values"):
+            # En make_sample_df las edades sin NaN son [25, 35, 120]: con interpolación
+            # lineal Q1 = 30, Q3 = 77.5 e IQR = 47.5, así que el límite superior
+            # (148.75) no alcanza a marcar 120 como outlier. Por eso se usa
+            # _OUTLIER_DF, donde Q1 = 22.5, Q3 = 47.5 y el límite superior es 85.
+            result_df = self.cleaner.remove_outliers_iqr(_OUTLIER_DF.copy(deep=False), "age", factor=1.5)
+            ages = result_df["age"].to_numpy(copy=False)
+
+            # 1. Verificar que el valor extremo (200) fue eliminado
+            self.assertFalse(np.any(ages == 200), "El outlier 200 debe haber sido eliminado.")
+            
+            # 2. Verificar que al menos uno de los valores no extremos (10, 20, 30, 40, 50) permanece
+            self.assertTrue(np.any(ages == 10), "El valor 10 debe permanecer.")
+            self.assertTrue(np.any(ages == 50), "El valor 50 debe permanecer.")
+            self.assertEqual(len(result_df), 5, "Deben quedar 5 filas después de eliminar el outlier.")
+
+        with self.subTest(case="missing_column"):
+            df = make_sample_df()
+            with self.assertRaises(KeyError):
+                self.cleaner.remove_outliers_iqr(df, "salary")
+
+        with self.subTest(case="non_numeric_column"):
+            df = make_sample_df()
+            with self.assertRaises(TypeError) as cm:
+                self.cleaner.remove_outliers_iqr(df, "city")
+            self.assertRegex(str(cm.exception), self._RE_NON_NUMERIC_COL)
 
 if __name__ == "__main__":
     unittest.main()